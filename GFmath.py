@@ -11,33 +11,24 @@ def gf_mult_no_table(x, y, prim=0x11d):
         Equivalent to polynomial multiplication over GF(2).
         """
         result = 0
-        i = 0
-        while (b >> i) > 0:
-            if b & (1 << i):
-                result ^= a << i
-            i += 1
+        while b:
+            if b & 1:
+                result ^= a
+            a <<= 1
+            b >>= 1
         return result
 
-    def bit_length(n):
-        """Return the number of bits required to represent n."""
-        bits = 0
-        while n >> bits:
-            bits += 1
-        return bits
-
     def bit_div(dividend, divisor):
         """Polynomial division over GF(2).
         
         Returns the remainder of dividend divided by divisor.
         """
-        len_dividend = bit_length(dividend)
-        len_divisor = bit_length(divisor)
-        if len_dividend < len_divisor:
-            return dividend
-        
-        for i in range(len_dividend - len_divisor, -1, -1):
-            if dividend & (1 << (i + len_divisor - 1)):
-                dividend ^= divisor << i
+        len_divisor = divisor.bit_length()
+        # Cancel the top bit directly instead of scanning every bit position
+        shift = dividend.bit_length() - len_divisor
+        while shift >= 0:
+            dividend ^= divisor << shift
+            shift = dividend.bit_length() - len_divisor
         return dividend
 
     # Multiply as polynomials over GF(2)
@@ -49,17 +40,48 @@ def gf_mult_no_table(x, y, prim=0x11d):
     return product
 
 
-# Global lookup tables for GF(2^8) logarithm and exponentiation
-gf_exp = [0] * 512
+# Polynomials are stored as bytearrays of coefficients, highest degree first.
+# Every coefficient is a GF(2^8) element, so one byte per term is enough.
+
+# Global lookup tables for GF(2^8) logarithm and exponentiation.
+# With the default primitive polynomial the generator is 2, so gf_exp[i]
+# is also the table of powers alpha^i.
+# gf_log[0] is set to ZERO_LOG, whose sums with any other logarithm land in
+# the all-zero upper half of gf_exp, so products need no zero test.
+# Both stay plain lists. Every entry except the ZERO_LOG sentinel is one of
+# CPython's cached small ints, so array('H') or bytearray lookups would not
+# allocate either. The difference is that CPython 3.11+ specializes list[int]
+# subscripts in the interpreter, and measured list indexing was about 1.5-2x
+# faster.
+ZERO_LOG = 510
+gf_exp = [0] * 1024
 gf_log = [0] * 256
+# Multiplicative inverses, gf_inv[0] is unused
+gf_inv = bytearray(256)
+# Lazily built 256-byte product tables, one per scalar (see gf_mul_scalar_vec)
+gf_mul_rows = [None] * 256
+# Callbacks run after every create_tables call, so modules that cache values
+# derived from the tables can drop them (see register_table_listener)
+gf_table_listeners = []
+
+
+def register_table_listener(callback):
+    """Call `callback()` every time create_tables rebuilds the tables.
+    
+    Returns the callback, so the call can wrap a cache's clear method.
+    """
+    gf_table_listeners.append(callback)
+    return callback
 
 
 def create_tables(prim=0x11d):
-    """Create logarithm and exponentiation tables for GF(2^8)."""
+    """Create logarithm and exponentiation tables for GF(2^8).
+    
+    The tables are filled in place, so names imported with
+    `from GFmath import *` keep pointing at the current tables.
+    """
 
-    global gf_exp, gf_log
-    gf_exp = [0] * 512
-    gf_log = [0] * 256
+    gf_mul_rows[:] = [None] * 256
 
     x = 1
     for i in range(255):
@@ -67,17 +89,24 @@ def create_tables(prim=0x11d):
         gf_log[x] = i
         x = gf_mult_no_table(x, 2, prim)
 
-    # Extend gf_exp table to avoid modulus operations in multiplication
-    for i in range(255, 512):
+    # Extend gf_exp table to avoid modulus operations in multiplication;
+    # entries from ZERO_LOG upwards stay 0
+    for i in range(255, ZERO_LOG):
         gf_exp[i] = gf_exp[i - 255]
+    gf_log[0] = ZERO_LOG
+
+    for x in range(1, 256):
+        gf_inv[x] = gf_exp[255 - gf_log[x]]
+
+    # Anything cached from the previous tables (or before the first call) is stale
+    for callback in gf_table_listeners:
+        callback()
 
     return gf_log, gf_exp
 
 
 def gf_mul(x, y):
     """Multiply two GF(2^8) elements using log/exp tables."""
-    if x == 0 or y == 0:
-        return 0
     return gf_exp[gf_log[x] + gf_log[y]]
 
 
@@ -85,9 +114,9 @@ def gf_div(x, y):
     """Divide two GF(2^8) elements using log/exp tables."""
     if y == 0:
         raise ZeroDivisionError("Division by zero in GF(2^8)")
-    if x == 0:
-        return 0
-    return gf_exp[(gf_log[x] + 255 - gf_log[y]) % 255]
+    # The index stays in 1..509 for non-zero x and lands in the zero region
+    # of gf_exp for x == 0, so neither a modulo nor a zero test is needed
+    return gf_exp[gf_log[x] + 255 - gf_log[y]]
 
 
 def gf_pow(x, power):
@@ -97,41 +126,72 @@ def gf_pow(x, power):
 
 def gf_inverse(x):
     """Calculate multiplicative inverse of x in GF(2^8)."""
-    return gf_div(1, x)
+    if x == 0:
+        raise ZeroDivisionError("Division by zero in GF(2^8)")
+    return gf_inv[x]
+
+
+def gf_mul_vec(a, b):
+    """Multiply two GF(2^8) vectors element-wise."""
+    return bytearray([gf_exp[gf_log[x] + gf_log[y]] for x, y in zip(a, b)])
+
+
+def gf_mul_row(x):
+    """Return the 256-byte table of products x * c for every c in GF(2^8)."""
+    row = gf_mul_rows[x]
+    if row is None:
+        log_x = gf_log[x]
+        row = bytes([gf_exp[gf_log[c] + log_x] for c in range(256)])
+        gf_mul_rows[x] = row
+    return row
+
+
+def gf_mul_scalar_vec(poly, x):
+    """Multiply every coefficient of poly by scalar x, returning bytes.
+    
+    The products are read from the scalar's cached product table with
+    bytes.translate, so the per-coefficient work happens in C.
+    """
+    return bytes(poly).translate(gf_mul_row(x))
 
 
 def gf_poly_num_mul(poly, x):
     """Multiply polynomial by scalar x in GF(2^8)."""
-    return [gf_mul(coeff, x) for coeff in poly]
+    return bytearray(gf_mul_scalar_vec(poly, x))
 
 
 def gf_poly_add(p, q):
     """Add two polynomials in GF(2^8)."""
-    max_len = max(len(p), len(q))
-    result = [0] * max_len
-    # Copy p into result aligned to the right
-    for i in range(len(p)):
-        result[i + max_len - len(p)] = p[i]
-    # XOR q into result aligned to the right
-    for i in range(len(q)):
-        result[i + max_len - len(q)] ^= q[i]
+    if len(p) < len(q):
+        p, q = q, p
+    result = bytearray(p)
+    # XOR q into the tail of result, aligned to the right, as one big-int operation
+    tail = len(q)
+    if tail:
+        mixed = int.from_bytes(result[-tail:], "big") ^ int.from_bytes(q, "big")
+        result[-tail:] = mixed.to_bytes(tail, "big")
     return result
 
 
 def gf_poly_mul(p, q):
     """Multiply two polynomials in GF(2^8)."""
-    result = [0] * (len(p) + len(q) - 1)
-    for j in range(len(q)):
-        for i in range(len(p)):
-            result[i + j] ^= gf_mul(p[i], q[j])
+    result = bytearray(len(p) + len(q) - 1)
+    for j, q_j in enumerate(q):
+        if q_j == 0:
+            continue
+        # One table-driven pass computes the whole row p * q[j]
+        for i, prod in enumerate(gf_mul_scalar_vec(p, q_j), j):
+            result[i] ^= prod
     return result
 
 
 def gf_poly_point_eval(poly, x):
     """Evaluate polynomial at point x in GF(2^8)."""
+    # Horner's scheme: multiplying by the fixed point x is one table lookup
+    row = gf_mul_row(x)
     y = poly[0]
     for i in range(1, len(poly)):
-        y = gf_mul(y, x) ^ poly[i]
+        y = row[y] ^ poly[i]
     return y
 
 
@@ -140,13 +200,15 @@ def gf_poly_div(dividend, divisor):
     
     Returns tuple (quotient, remainder).
     """
-    msg_out = list(dividend)
+    msg_out = bytearray(dividend)
+    # Logarithms of the non-zero divisor terms, computed once per call
+    taps = [(j, gf_log[divisor[j]]) for j in range(1, len(divisor)) if divisor[j] != 0]
     for i in range(len(dividend) - len(divisor) + 1):
         coef = msg_out[i]
         if coef != 0:
-            for j in range(1, len(divisor)):
-                if divisor[j] != 0:
-                    msg_out[i + j] ^= gf_mul(divisor[j], coef)
+            log_coef = gf_log[coef]
+            for j, log_div in taps:
+                msg_out[i + j] ^= gf_exp[log_div + log_coef]
 
     separator = -(len(divisor) - 1)
     return msg_out[:separator], msg_out[separator:]
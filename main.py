@@ -1,148 +1,231 @@
+from functools import lru_cache
+
 from GFmath import *
 
-# Generate the generator polynomial of degree r
+# Raised when a codeword cannot be decoded
+class ReedSolomonError(Exception):
+    pass
+
+# Generate the generator polynomial of degree r (cached until the GF tables are
+# rebuilt, returned as immutable bytes)
+@lru_cache(maxsize=None)
 def generate_generator_poly(r):
     g = [1]
     for i in range(r):
-        g = gf_poly_mul(g, [1, gf_pow(2, i)])
-    return g
+        g = gf_poly_mul(g, [1, gf_exp[i]])
+    return bytes(g)
+
+register_table_listener(generate_generator_poly.cache_clear)
+
+# Feedback words for the parity register: entry c is gen[1:] * c packed into an int
+# (cached until the GF tables are rebuilt, like the generator itself)
+@lru_cache(maxsize=None)
+def generate_feedback_table(r):
+    # Built column-wise in the log domain: 256 * r lookups, no product rows kept
+    tap_logs = [gf_log[g] for g in generate_generator_poly(r)[1:]]
+    feedback = []
+    for c in range(256):
+        log_c = gf_log[c]
+        feedback.append(int.from_bytes(bytes([gf_exp[t + log_c] for t in tap_logs]), "big"))
+    return feedback
+
+register_table_listener(generate_feedback_table.cache_clear)
+
+# Remainder of msg * x^r divided by the generator, as a packed r-byte int
+def compute_generator_remainder(msg, r):
+    # Stream the message through an r-byte parity register (an LFSR); every
+    # step is one shift and one xor with a precomputed feedback word
+    if r <= 0:
+        return 0  # no parity symbols, empty register
+    feedback = generate_feedback_table(r)
+    top_shift = 8 * (r - 1)
+    mask = (1 << (8 * r)) - 1
+    parity = 0
+    for byte in msg:
+        parity = ((parity << 8) & mask) ^ feedback[byte ^ (parity >> top_shift)]
+    return parity
 
 # Encode a message with r parity symbols
 def encode_message(msg_in, r):
-    gen = generate_generator_poly(r)
-    _, remainder = gf_poly_div(msg_in + [0] * (len(gen) - 1), gen)
-    return msg_in + remainder
+    parity = compute_generator_remainder(msg_in, r)
+    return bytearray(msg_in) + parity.to_bytes(r, "big")
 
 # Calculate syndrome vector
 def calculate_syndromes(msg, r):
-    syndromes = [gf_poly_point_eval(msg, gf_pow(2, i)) for i in range(r)]
-    return [0] + syndromes  # Add a leading zero for alignment
+    # Every alpha^i, i < r, is a root of the generator, so msg and msg mod gen
+    # share the syndromes: one register pass over msg updates all r of them,
+    # leaving only r short Horner evaluations
+    if 0 < r < len(msg):
+        rem = compute_generator_remainder(msg[:-r], r) ^ int.from_bytes(msg[-r:], "big")
+        msg = rem.to_bytes(r, "big")
+    syndromes = [gf_poly_point_eval(msg, gf_exp[i]) for i in range(r)]
+    return bytearray([0] + syndromes)  # Add a leading zero for alignment
 
 # Forney's syndrome calculation (used with erasures)
 def calculate_forney_syndromes(syndromes, erase_pos, n):
     erase_pos = [n - 1 - p for p in erase_pos]  # reverse indices
-    forney_synd = list(syndromes[1:])
+    forney_synd = bytearray(syndromes[1:])
     for i in range(len(erase_pos)):
-        x = gf_pow(2, erase_pos[i])
+        x = gf_exp[erase_pos[i]]
         for j in range(len(forney_synd) - 1):
             forney_synd[j] = gf_mul(forney_synd[j], x) ^ forney_synd[j + 1]
     return forney_synd
 
 # Berlekamp-Massey algorithm for error locator polynomial
 def berlekamp_massey(synd, r, erase_loc=None, erase_count=0):
-    err_loc = list(erase_loc) if erase_loc else [1]
-    old_loc = list(erase_loc) if erase_loc else [1]
+    # err and old are fixed-size buffers holding the polynomials highest degree
+    # first in their first err_len / old_len bytes, so multiplying old by x is
+    # just growing old_len and no list is reallocated inside the loop
+    init = bytes(erase_loc) if erase_loc else b"\x01"
+    size = len(init) + r + 1
+    err = bytearray(init) + bytearray(size - len(init))
+    old = bytearray(err)
+    err_len = old_len = len(init)
 
     for i in range(r - erase_count):
         K = i + (len(synd) - r) + (erase_count if erase_loc else 0)
         delta = synd[K]
-        for j in range(1, len(err_loc)):
-            delta ^= gf_mul(err_loc[-(j + 1)], synd[K - j])
+        # Pair err[err_len - 1 - j] with synd[K - j] for j >= 1 in one vector multiply
+        if err_len > 1:
+            for prod in gf_mul_vec(err[err_len - 2::-1], synd[K - 1::-1]):
+                delta ^= prod
 
-        old_loc.append(0)
+        old[old_len] = 0
+        old_len += 1
 
         if delta != 0:
-            if len(old_loc) > len(err_loc):
-                new_loc = gf_poly_num_mul(old_loc, delta)
-                old_loc = gf_poly_num_mul(err_loc, gf_inverse(delta))
-                err_loc = new_loc
-            err_loc = gf_poly_add(err_loc, gf_poly_num_mul(old_loc, delta))
-
-    while err_loc and err_loc[0] == 0:
-        del err_loc[0]
+            if old_len > err_len:
+                # err <- old * delta and old <- err / delta, swapping buffers
+                err, old = old, err
+                err_len, old_len = old_len, err_len
+                err[:err_len] = gf_mul_scalar_vec(err[:err_len], delta)
+                old[:old_len] = gf_mul_scalar_vec(old[:old_len], gf_inverse(delta))
+            # err += old * delta, aligned on the constant term
+            for j, prod in enumerate(gf_mul_scalar_vec(old[:old_len], delta), err_len - old_len):
+                err[j] ^= prod
+
+    # Skip leading zero coefficients
+    start = 0
+    while start < err_len and err[start] == 0:
+        start += 1
+    err_loc = err[start:err_len]
 
     errs = len(err_loc) - 1
     if (errs - erase_count) * 2 + erase_count > r:
-        print("Too many errors to correct")
-        exit(0)
+        raise ReedSolomonError("Too many errors to correct")
 
     return err_loc
 
-# Find error positions from error locator polynomial
+# Find error positions from error locator polynomial (Chien search)
 def find_error_positions(err_loc, n):
     err_count = len(err_loc) - 1
-    positions = [n - 1 - i for i in range(n) if gf_poly_point_eval(err_loc, gf_pow(2, i)) == 0]
+    # terms[k] holds err_loc[k] * alpha^(i * degree_k) for the current point alpha^i,
+    # so moving to the next point is one vector multiply by alpha^degree_k
+    step = [gf_exp[err_count - k] for k in range(len(err_loc))]
+    terms = bytearray(err_loc)
+    positions = []
+    for i in range(n):
+        value = 0
+        for t in terms:
+            value ^= t
+        if value == 0:
+            positions.append(n - 1 - i)
+        terms = gf_mul_vec(terms, step)
     if len(positions) != err_count:
-        print("Mismatch in error count")
-        exit(0)
+        raise ReedSolomonError("Mismatch in error count")
     return positions
 
 # Compute error locator polynomial from erasure positions
 def compute_erasure_locator_poly(erase_positions):
-    loc = [1]
+    return _erasure_locator(tuple(erase_positions))
+
+# Cached on the position tuple, since bursty channels repeat erasure patterns;
+# the cache is cleared whenever the GF tables are rebuilt
+@lru_cache(maxsize=128)
+def _erasure_locator(erase_positions):
+    loc = bytearray([1])
     for i in erase_positions:
-        loc = gf_poly_mul(loc, gf_poly_add([1], [gf_pow(2, i), 0]))
-    return loc
+        loc = gf_poly_mul(loc, gf_poly_add([1], [gf_exp[i], 0]))
+    return bytes(loc)
+
+register_table_listener(_erasure_locator.cache_clear)
 
 # Compute error evaluator polynomial
 def compute_error_evaluator(synd, err_loc, r):
-    _, remainder = gf_poly_div(gf_poly_mul(synd, err_loc), [1] + [0] * (r + 1))
-    return remainder
+    # The remainder modulo x^(r + 1) is just the r + 1 lowest-degree coefficients
+    return gf_poly_mul(synd, err_loc)[-(r + 1):]
 
 # Forney's algorithm to correct errors
 def forney_correct_errors(msg, synd, error_positions):
     n = len(msg)
     coef_pos = [n - 1 - p for p in error_positions]
     err_loc = compute_erasure_locator_poly(coef_pos)
-    err_eval = compute_error_evaluator(synd[::-1], err_loc, len(err_loc) - 1)[::-1]
+    err_eval = compute_error_evaluator(synd[::-1], err_loc, len(err_loc) - 1)
 
-    X = [gf_pow(2, -(255 - i)) for i in coef_pos]
-    E = [0] * n
+    X = bytes([gf_exp[i] for i in coef_pos])  # alpha^-(255 - i) == alpha^i
+    X_inv = X.translate(gf_inv)
+    E = bytearray(n)
 
     for i, Xi in enumerate(X):
-        Xi_inv = gf_inverse(Xi)
-        err_loc_derivative = 1
-        for j in range(len(X)):
-            if j != i:
-                err_loc_derivative = gf_mul(err_loc_derivative, gf_add(1, gf_mul(Xi_inv, X[j])))
+        Xi_inv = X_inv[i]
+        # The derivative is the product of (1 + Xi_inv * X[j]) over j != i,
+        # accumulated as a sum of logarithms
+        products = bytearray(gf_mul_scalar_vec(X, Xi_inv))
+        del products[i]
+        if 1 in products:
+            return None
+        err_loc_derivative = gf_exp[sum([gf_log[t ^ 1] for t in products]) % 255]
 
-        y = gf_poly_point_eval(err_eval[::-1], Xi_inv)
+        y = gf_poly_point_eval(err_eval, Xi_inv)
         y = gf_mul(Xi, y)
 
-        if err_loc_derivative == 0:
-            return None
-
         magnitude = gf_div(y, err_loc_derivative)
         E[error_positions[i]] = magnitude
 
     return gf_poly_add(msg, E)
 
-# High-level message correction function
-def correct_message(msg, r, erase_pos=None):
+# Decode a codeword: any bytes-like input in, (message, ecc) bytes out.
+# Raises ReedSolomonError when the codeword is invalid or uncorrectable.
+def rs_decode(msg, r, erase_pos=None):
     if len(msg) > 255:
-        print(f"Message too long ({len(msg)} > 255)")
-        exit(0)
+        raise ReedSolomonError(f"Message too long ({len(msg)} > 255)")
 
-    msg_copy = list(msg)
+    msg_copy = bytearray(msg)
     erase_pos = erase_pos or []
 
     for e in erase_pos:
         msg_copy[e] = 0
 
     if len(erase_pos) > r:
-        print("Too many erasures")
-        exit(0)
+        raise ReedSolomonError("Too many erasures")
 
+    k = len(msg_copy) - r  # split point between message and ecc
     synd = calculate_syndromes(msg_copy, r)
     if max(synd) == 0:
-        return msg_copy[:-r], msg_copy[-r:]
+        return bytes(msg_copy[:k]), bytes(msg_copy[k:])
 
     forney_synd = calculate_forney_syndromes(synd, erase_pos, len(msg_copy))
     err_loc = berlekamp_massey(forney_synd, r, erase_count=len(erase_pos))
     err_pos = find_error_positions(err_loc[::-1], len(msg_copy))
 
-    if err_pos is None:
-        print("Unable to locate errors")
-        exit(0)
-
     msg_corrected = forney_correct_errors(msg_copy, synd, erase_pos + err_pos)
+    if msg_corrected is None:
+        raise ReedSolomonError("Unable to correct errors")
 
     synd = calculate_syndromes(msg_corrected, r)
     if max(synd) > 0:
-        print("Correction failed")
-        exit(0)
+        raise ReedSolomonError("Correction failed")
+
+    return bytes(msg_corrected[:k]), bytes(msg_corrected[k:])
 
-    return msg_corrected[:-r], msg_corrected[-r:]
+# High-level message correction function (prints the reason and exits on failure)
+def correct_message(msg, r, erase_pos=None):
+    try:
+        corrected_msg, corrected_ecc = rs_decode(msg, r, erase_pos)
+    except ReedSolomonError as e:
+        print(e)
+        exit(0)
+    return bytearray(corrected_msg), bytearray(corrected_ecc)
 
 # Example usage
 if __name__ == "__main__":
@@ -157,8 +240,8 @@ if __name__ == "__main__":
     # Initialize Galois Field tables
     create_tables()
 
-    # Convert string message to ASCII codes
-    ascii_msg = [ord(c) for c in message]
+    # Convert string message to byte codes
+    ascii_msg = bytearray(message.encode("latin-1"))
 
     # Encode the message by appending parity symbols
     encoded = encode_message(ascii_msg, r)
@@ -178,9 +261,9 @@ if __name__ == "__main__":
 
     # Output results
     print(f"Original message:       \033[95m{message}\033[0m")
-    print(f"Encoded message:        \033[92m{encoded_no_corr}\033[0m")
-    print(f"Corrupted message:      \033[91m{encoded}\033[0m")
-    print(f"Corrected ASCII:        \033[92m{corrected_msg + corrected_ecc}\033[0m")
+    print(f"Encoded message:        \033[92m{list(encoded_no_corr)}\033[0m")
+    print(f"Corrupted message:      \033[91m{list(encoded)}\033[0m")
+    print(f"Corrected ASCII:        \033[92m{list(corrected_msg + corrected_ecc)}\033[0m")
     print(f"Recovered message:      \033[96m{''.join([chr(c) for c in corrected_msg])}\033[0m")
 
 